@@ -4,7 +4,8 @@
 # dependencies = [
 #     "mcp>=1.0.0",
 #     "fastmcp>=2.12.5",
-#     "paramiko>=4.0.0",
+#     "asyncssh>=2.14.0",
+#     "orjson>=3.9.0",
 #     "pydantic>=2.12.3",
 #     "python-dotenv>=1.1.1",
 #     "uvicorn>=0.38.0",
@@ -22,22 +23,36 @@ This MCP server enables LLMs to interact with Proxmox VE containers by:
 The server connects to the Proxmox host via SSH and uses the 'pct' command-line tool.
 """
 
+import asyncio
+import functools
 import json
+import logging
 import os
 import re
-import uuid
-from contextlib import asynccontextmanager
+import shlex
+import time
+from contextlib import asynccontextmanager, nullcontext, suppress
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional, Dict, Any, List, Tuple
+from pathlib import PurePosixPath
+from typing import Optional, Dict, Any, List, Set, Tuple, Union
 
-import paramiko
+import asyncssh
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 from pydantic import BaseModel, Field, ConfigDict
 
+try:
+    # Optional: much faster JSON serialization for large command output
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables from .env file
 load_dotenv()
 
+logger = logging.getLogger("proxmox_mcp")
+
 # ============================================================================
 # Constants
 # ============================================================================
@@ -45,47 +60,147 @@ load_dotenv()
 # Default character limit (can be overridden via environment variable)
 DEFAULT_CHARACTER_LIMIT = 25000
 
+# Default cap on command output kept in memory, per stream (can be overridden via environment variable)
+DEFAULT_MAX_OUTPUT_BYTES = 1048576
+
+# Default number of pooled SSH connections (can be overridden via environment variable)
+DEFAULT_SSH_POOL_SIZE = 4
+
+# Pooled connections idle for longer than this (seconds) are probed before reuse
+POOL_VALIDATE_AFTER = 60
+
+# SSH keepalive: probe every 30s, drop the connection after 3 missed replies
+SSH_KEEPALIVE_INTERVAL = 30
+SSH_KEEPALIVE_COUNT_MAX = 3
+
+# SFTP transfer tuning defaults: block size per request and how many requests
+# are kept in flight at once (overridable via environment variables)
+DEFAULT_SFTP_BLOCK_SIZE = 262144
+DEFAULT_SFTP_MAX_REQUESTS = 64
+
+# Largest SFTP write OpenSSH's sftp-server accepts (256 KiB message limit
+# minus room for the request header); larger reads are simply returned short
+SFTP_MAX_WRITE_SIZE = 261120
+
+# Bounds for the SSH channel receive window. It is sized to hold a full
+# pipeline of SFTP reads (block size x requests in flight) so flow control
+# doesn't stall transfers; the buffer only fills if a reader falls behind
+SSH_MIN_WINDOW = 2097152
+SSH_MAX_WINDOW = 67108864
+
+# Errors meaning the SFTP session itself is gone (as opposed to a failed
+# request), after which the session is discarded and reopened on next use
+_SFTP_SESSION_ERRORS = (
+    asyncssh.SFTPConnectionLost,
+    asyncssh.SFTPNoConnection,
+    ConnectionError,
+)
+
+# Valid octal permission strings: 3 or 4 digits, all 0-7 (use with fullmatch,
+# since '$' would also accept a trailing newline)
+_PERMS_RE = re.compile(r"[0-7]{3,4}")
+
+# One 'pct list' row: VMID, status and the following column
+_PCT_ROW_RE = re.compile(r"^[ \t]*(\d+)[ \t]+(\S+)[ \t]+(\S+)", re.M)
+
+# Commands made only of these characters can be framed safely inside the
+# persistent shell; anything else gets its own exec channel
+_SHELL_SAFE_COMMAND_RE = re.compile(r"[\w ./:=,@%+-]+")
+
+# Header of the text-format container table
+_CONTAINER_TABLE_HEADER = "VMID | Status | Name\n" + "-" * 40 + "\n"
+
+# Exit code used by remote upload scripts to report that the destination exists
+FILE_EXISTS_EXIT_CODE = 17
+
+# Seconds a `pct list` result is reused before querying the host again
+CONTAINER_LIST_TTL = 5.0
+
+# Window in seconds during which concurrent status lookups share one `pct list`
+STATUS_BATCH_WINDOW = 0.01
+
+# Parsed 'pct status' results, shared rather than rebuilt per call
+_STATUS_RUNNING = {"status": "running"}
+_STATUS_STOPPED = {"status": "stopped"}
+_STATUS_UNKNOWN = {"status": "unknown"}
+
+# Startup error shown until the user explicitly accepts the risks
+_RISK_ERROR = (
+    "You must explicitly accept the risks before using this software.\n"
+    "Set environment variable: I_ACCEPT_RISKS=true\n\n"
+    "By setting this to 'true', you acknowledge that:\n"
+    "  - You understand the risks of giving AI system SSH access to your infrastructure\n"
+    "  - You are solely responsible for reviewing and approving commands\n"
+    "  - You have proper backups and disaster recovery procedures in place\n"
+    "  - You will not hold the developer(s) liable for any damages or losses\n\n"
+    "See README DISCLAIMER section for full details."
+)
+
 # ============================================================================
 # Configuration Models
 # ============================================================================
 
 
+def _env_int(name: str, default: int) -> int:
+    """Read an integer environment variable"""
+    return int(os.getenv(name, str(default)))
+
+
+def _env_flag(name: str) -> bool:
+    """Read a boolean environment variable (only "true" enables it)"""
+    return os.getenv(name, "false").lower() == "true"
+
+
+@dataclass(frozen=True, slots=True)
 class ProxmoxConfig:
     """Proxmox connection configuration from environment variables"""
 
-    def __init__(self):
-        self.host = os.getenv("HOST")
-        self.port = int(os.getenv("SSH_PORT", "22"))
-        self.username = os.getenv("SSH_USERNAME", "root")
-        self.password = os.getenv("SSH_PASSWORD")
-        self.key_path = os.getenv("SSH_KEY")
-        # CRITICAL: User must explicitly accept risks
-        self.accept_risks = os.getenv("I_ACCEPT_RISKS", "false").lower() == "true"
-        # Feature flag for host command execution (default: disabled for safety)
-        self.enable_host_exec = os.getenv("ENABLE_HOST_EXEC", "false").lower() == "true"
-        # Maximum character limit for responses (default: 25000)
-        self.character_limit = int(
-            os.getenv("CHARACTER_LIMIT", str(DEFAULT_CHARACTER_LIMIT))
-        )
-        # Maximum file size for transfers in bytes (default: 10MB)
-        self.max_file_size = int(os.getenv("MAX_FILE_SIZE", "10485760"))
-        # HTTP server port (default: 8000)
-        self.server_port = int(os.getenv("SERVER_PORT", "8000"))
+    host: Optional[str] = field(default_factory=lambda: os.getenv("HOST"))
+    port: int = field(default_factory=lambda: _env_int("SSH_PORT", 22))
+    username: str = field(default_factory=lambda: os.getenv("SSH_USERNAME", "root"))
+    # Kept out of repr so the secret never ends up in logs
+    password: Optional[str] = field(
+        default_factory=lambda: os.getenv("SSH_PASSWORD"), repr=False
+    )
+    key_path: Optional[str] = field(default_factory=lambda: os.getenv("SSH_KEY"))
+    # CRITICAL: User must explicitly accept risks
+    accept_risks: bool = field(default_factory=lambda: _env_flag("I_ACCEPT_RISKS"))
+    # Feature flag for host command execution (default: disabled for safety)
+    enable_host_exec: bool = field(
+        default_factory=lambda: _env_flag("ENABLE_HOST_EXEC")
+    )
+    # Maximum character limit for responses (default: 25000)
+    character_limit: int = field(
+        default_factory=lambda: _env_int("CHARACTER_LIMIT", DEFAULT_CHARACTER_LIMIT)
+    )
+    # Maximum file size for transfers in bytes (default: 10MB)
+    max_file_size: int = field(
+        default_factory=lambda: _env_int("MAX_FILE_SIZE", 10485760)
+    )
+    # HTTP server port (default: 8000)
+    server_port: int = field(default_factory=lambda: _env_int("SERVER_PORT", 8000))
+    # SFTP block size in bytes for file transfers (default: 256KB)
+    sftp_block_size: int = field(
+        default_factory=lambda: _env_int("SFTP_BLOCK_SIZE", DEFAULT_SFTP_BLOCK_SIZE)
+    )
+    # SFTP read/write requests kept in flight per transfer (default: 64)
+    sftp_max_requests: int = field(
+        default_factory=lambda: _env_int("SFTP_MAX_REQUESTS", DEFAULT_SFTP_MAX_REQUESTS)
+    )
+    # Maximum bytes of stdout/stderr kept per command (default: 1MB)
+    max_output_bytes: int = field(
+        default_factory=lambda: _env_int("MAX_OUTPUT_BYTES", DEFAULT_MAX_OUTPUT_BYTES)
+    )
+    # Number of SSH connections kept open to the host (default: 4)
+    ssh_pool_size: int = field(
+        default_factory=lambda: _env_int("SSH_POOL_SIZE", DEFAULT_SSH_POOL_SIZE)
+    )
 
     def validate(self) -> Tuple[bool, Optional[str]]:
         """Validate configuration"""
         # CRITICAL: Check risk acceptance FIRST
         if not self.accept_risks:
-            return False, (
-                "You must explicitly accept the risks before using this software.\n"
-                "Set environment variable: I_ACCEPT_RISKS=true\n\n"
-                "By setting this to 'true', you acknowledge that:\n"
-                "  - You understand the risks of giving AI system SSH access to your infrastructure\n"
-                "  - You are solely responsible for reviewing and approving commands\n"
-                "  - You have proper backups and disaster recovery procedures in place\n"
-                "  - You will not hold the developer(s) liable for any damages or losses\n\n"
-                "See README DISCLAIMER section for full details."
-            )
+            return False, _RISK_ERROR
 
         if not self.host:
             return False, "HOST environment variable is required"
@@ -93,6 +208,18 @@ class ProxmoxConfig:
         if not self.password and not self.key_path:
             return False, "Either SSH_PASSWORD or SSH_KEY must be set"
 
+        if self.sftp_block_size < 1:
+            return False, "SFTP_BLOCK_SIZE must be a positive number of bytes"
+
+        if self.sftp_max_requests < 1:
+            return False, "SFTP_MAX_REQUESTS must be at least 1"
+
+        if self.max_output_bytes < 1:
+            return False, "MAX_OUTPUT_BYTES must be a positive number of bytes"
+
+        if self.ssh_pool_size < 1:
+            return False, "SSH_POOL_SIZE must be at least 1"
+
         return True, None
 
 
@@ -111,9 +238,7 @@ class ResponseFormat(str, Enum):
 class ExecCommandInput(BaseModel):
     """Input model for executing commands in a container"""
 
-    model_config = ConfigDict(
-        str_strip_whitespace=True, validate_assignment=True, extra="forbid"
-    )
+    model_config = ConfigDict(str_strip_whitespace=True, frozen=True, extra="forbid")
 
     vmid: int = Field(
         ..., description="Container VM ID (e.g., 100, 101, 102)", ge=100, le=999999999
@@ -136,9 +261,7 @@ class ExecCommandInput(BaseModel):
 class ContainerStatusInput(BaseModel):
     """Input model for getting container status"""
 
-    model_config = ConfigDict(
-        str_strip_whitespace=True, validate_assignment=True, extra="forbid"
-    )
+    model_config = ConfigDict(str_strip_whitespace=True, frozen=True, extra="forbid")
 
     vmid: int = Field(
         ..., description="Container VM ID to check status for", ge=100, le=999999999
@@ -152,9 +275,7 @@ class ContainerStatusInput(BaseModel):
 class ContainerActionInput(BaseModel):
     """Input model for container actions (start/stop)"""
 
-    model_config = ConfigDict(
-        str_strip_whitespace=True, validate_assignment=True, extra="forbid"
-    )
+    model_config = ConfigDict(str_strip_whitespace=True, frozen=True, extra="forbid")
 
     vmid: int = Field(
         ..., description="Container VM ID to perform action on", ge=100, le=999999999
@@ -164,9 +285,7 @@ class ContainerActionInput(BaseModel):
 class ListContainersInput(BaseModel):
     """Input model for listing containers"""
 
-    model_config = ConfigDict(
-        str_strip_whitespace=True, validate_assignment=True, extra="forbid"
-    )
+    model_config = ConfigDict(str_strip_whitespace=True, frozen=True, extra="forbid")
 
     response_format: ResponseFormat = Field(
         default=ResponseFormat.JSON,
@@ -177,9 +296,7 @@ class ListContainersInput(BaseModel):
 class HostExecCommandInput(BaseModel):
     """Input model for executing commands on Proxmox host"""
 
-    model_config = ConfigDict(
-        str_strip_whitespace=True, validate_assignment=True, extra="forbid"
-    )
+    model_config = ConfigDict(str_strip_whitespace=True, frozen=True, extra="forbid")
 
     command: str = Field(
         ...,
@@ -199,9 +316,7 @@ class HostExecCommandInput(BaseModel):
 class DownloadFileFromContainerInput(BaseModel):
     """Input model for downloading files from container"""
 
-    model_config = ConfigDict(
-        str_strip_whitespace=True, validate_assignment=True, extra="forbid"
-    )
+    model_config = ConfigDict(str_strip_whitespace=True, frozen=True, extra="forbid")
 
     vmid: int = Field(
         ..., description="Container VM ID to download file from", ge=100, le=999999999
@@ -227,9 +342,7 @@ class DownloadFileFromContainerInput(BaseModel):
 class UploadFileToContainerInput(BaseModel):
     """Input model for uploading files to container"""
 
-    model_config = ConfigDict(
-        str_strip_whitespace=True, validate_assignment=True, extra="forbid"
-    )
+    model_config = ConfigDict(str_strip_whitespace=True, frozen=True, extra="forbid")
 
     vmid: int = Field(
         ..., description="Container VM ID to upload file to", ge=100, le=999999999
@@ -259,9 +372,7 @@ class UploadFileToContainerInput(BaseModel):
 class DownloadFileFromHostInput(BaseModel):
     """Input model for downloading files from Proxmox host"""
 
-    model_config = ConfigDict(
-        str_strip_whitespace=True, validate_assignment=True, extra="forbid"
-    )
+    model_config = ConfigDict(str_strip_whitespace=True, frozen=True, extra="forbid")
 
     host_path: str = Field(
         ...,
@@ -284,9 +395,7 @@ class DownloadFileFromHostInput(BaseModel):
 class UploadFileToHostInput(BaseModel):
     """Input model for uploading files to Proxmox host"""
 
-    model_config = ConfigDict(
-        str_strip_whitespace=True, validate_assignment=True, extra="forbid"
-    )
+    model_config = ConfigDict(str_strip_whitespace=True, frozen=True, extra="forbid")
 
     local_path: str = Field(
         ...,
@@ -315,102 +424,565 @@ class UploadFileToHostInput(BaseModel):
 # ============================================================================
 
 
-class SSHConnectionManager:
-    """Manages SSH connections to Proxmox host"""
+async def read_stream_capped(
+    stream: asyncssh.SSHReader, limit: int, end: Optional[bytes] = None
+) -> Tuple[bytes, Optional[bytes], bool]:
+    """Read an SSH output stream keeping at most `limit` bytes in memory
+
+    Reads until EOF, or - when `end` is given - until the end marker followed
+    by the rest of its line has arrived. Once the limit is exceeded reading
+    stops and the channel is closed so the remote side stops sending.
+
+    Returns:
+        Tuple: (data, trailer after the end marker, truncated) - the trailer
+        is None if `end` was given but EOF arrived before it
+    """
+    buf = bytearray()
+    end_pos = -1
+
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            # EOF before the end marker means the output is incomplete
+            return bytes(buf), None if end is not None else b"", False
+
+        search_from = max(0, len(buf) - len(end) + 1) if end is not None else 0
+        buf += chunk
+
+        if end is not None:
+            if end_pos == -1:
+                end_pos = buf.find(end, search_from)
+            if end_pos != -1 and buf.endswith(b"\n"):
+                return bytes(buf[:end_pos]), bytes(buf[end_pos + len(end) :]), False
+
+        if end_pos == -1 and len(buf) > limit:
+            stream.channel.close()
+            return bytes(buf[:limit]), b"", True
+
+
+class PooledConnection:
+    """A pooled SSH connection and its bookkeeping"""
+
+    def __init__(self, conn: Optional[asyncssh.SSHClientConnection] = None):
+        self.conn = conn
+        self.last_used = time.monotonic()
+        # Long-lived shell session reused for simple commands
+        self.shell: Optional[asyncssh.SSHClientProcess] = None
+        # Long-lived SFTP session reused by all file operations
+        self.sftp: Optional[asyncssh.SFTPClient] = None
+
+    def close_shell(self) -> None:
+        """Discard the persistent shell session"""
+        if self.shell is not None:
+            self.shell.close()
+            self.shell = None
+
+    async def get_sftp(self) -> asyncssh.SFTPClient:
+        """Return the SFTP session for this connection, starting it if needed"""
+        if self.sftp is None:
+            self.sftp = await self.conn.start_sftp_client()
+        return self.sftp
+
+    def close_sftp(self) -> None:
+        """Close the SFTP session - safe to call more than once"""
+        if self.sftp is not None:
+            try:
+                self.sftp.exit()
+            except OSError:
+                # The channel is already closed
+                pass
+            self.sftp = None
+
+    def close(self) -> None:
+        """Close the connection together with its shell and SFTP sessions"""
+        self.close_shell()
+        self.close_sftp()
+        if self.conn is not None:
+            self.conn.close()
+
+    async def run_command(
+        self, command: str, timeout: int, limit: int
+    ) -> Tuple[str, str, int, bool]:
+        """Run a command on its own exec channel
+
+        Returns:
+            Tuple: (stdout, stderr, exit_code, truncated) - exit_code is -1
+            if the output limit was hit and the channel closed early
+        """
+        process = await self.conn.create_process(command, encoding=None)
+
+        async def run() -> Tuple[bytes, bytes, bool]:
+            (stdout_data, _, stdout_cut), (stderr_data, _, stderr_cut) = (
+                await asyncio.gather(
+                    read_stream_capped(process.stdout, limit),
+                    read_stream_capped(process.stderr, limit),
+                )
+            )
+            await process.wait_closed()
+            return stdout_data, stderr_data, stdout_cut or stderr_cut
+
+        try:
+            stdout_data, stderr_data, truncated = await asyncio.wait_for(run(), timeout)
+        finally:
+            process.close()
+
+        exit_code = process.exit_status
+        return (
+            stdout_data.decode("utf-8", errors="replace"),
+            stderr_data.decode("utf-8", errors="replace"),
+            -1 if exit_code is None else exit_code,
+            truncated,
+        )
+
+    async def run_in_shell(
+        self, command: str, timeout: int, limit: int
+    ) -> Tuple[str, str, int, bool]:
+        """Run a command over the persistent shell session
+
+        Avoids opening a new SSH channel per command. Each command runs in a
+        subshell with stdin detached, followed by end markers on stdout and
+        stderr carrying the exit code, so output framing stays intact. The
+        command goes through `eval`, so a syntax error fails the command
+        rather than killing the shell.
+
+        Returns:
+            Tuple: (stdout, stderr, exit_code, truncated) - exit_code is -1
+            if the output limit was hit and the shell discarded
+
+        Raises:
+            RuntimeError: If the shell exits before the command completes
+        """
+        marker = os.urandom(16).hex().encode()
+
+        async def run() -> Tuple[bytes, bytes, int, bool]:
+            if self.shell is None:
+                # bash, not sh: commands sent through a plain exec channel run
+                # in root's login shell (bash on Proxmox), and simple commands
+                # must behave the same here (echo -e, source, ...)
+                self.shell = await self.conn.create_process("exec bash", encoding=None)
+
+            self.shell.stdin.write(
+                # Shell-safe commands contain no quotes, so single quotes suffice
+                b"(eval '" + command.encode() + b"') </dev/null\n"
+                b"printf '\\n" + marker + b":%d\\n' $?\n"
+                b"printf '\\n" + marker + b"\\n' >&2\n"
+            )
+            stdout_result, stderr_result = await asyncio.gather(
+                read_stream_capped(self.shell.stdout, limit, b"\n" + marker + b":"),
+                read_stream_capped(self.shell.stderr, limit, b"\n" + marker + b"\n"),
+            )
+            stdout_data, exit_line, stdout_cut = stdout_result
+            stderr_data, stderr_end, stderr_cut = stderr_result
+            if stdout_cut or stderr_cut:
+                # Framing is lost once output is cut short - the shell can't be reused
+                self.close_shell()
+                return stdout_data, stderr_data, -1, True
+            if exit_line is None or stderr_end is None:
+                # Connection dropped, reboot, ... - the exit status is unknown
+                raise RuntimeError("Shell session ended before the command completed")
+
+            return stdout_data, stderr_data, int(exit_line), False
+
+        try:
+            stdout_data, stderr_data, exit_code, truncated = await asyncio.wait_for(
+                run(), timeout
+            )
+        except BaseException:
+            # Framing is lost once a command fails midway - start a fresh shell next time
+            self.close_shell()
+            raise
+
+        return (
+            stdout_data.decode("utf-8", errors="replace"),
+            stderr_data.decode("utf-8", errors="replace"),
+            exit_code,
+            truncated,
+        )
+
+
+class SSHConnectionPool:
+    """Bounded pool of authenticated SSH connections to Proxmox host
+
+    Each tool request borrows a connection for the duration of its remote
+    operation, so concurrent requests don't contend on a single transport.
+    """
 
     def __init__(self, config: ProxmoxConfig):
         self.config = config
-        self._client: Optional[paramiko.SSHClient] = None
-        self._sftp: Optional[paramiko.SFTPClient] = None
+        self.size = config.ssh_pool_size
+        self.window = min(
+            max(config.sftp_block_size * config.sftp_max_requests, SSH_MIN_WINDOW),
+            SSH_MAX_WINDOW,
+        )
+        self._entries: List[PooledConnection] = []
+        self._idle: asyncio.Queue = asyncio.Queue()
+
+    async def _make_conn(self) -> asyncssh.SSHClientConnection:
+        """Open and authenticate a new SSH connection"""
+        if self.config.key_path:
+            # Connect using SSH key
+            auth = {"client_keys": [self.config.key_path]}
+        else:
+            # Connect using password
+            auth = {"password": self.config.password}
+
+        return await asyncssh.connect(
+            self.config.host,
+            port=self.config.port,
+            username=self.config.username,
+            known_hosts=None,
+            connect_timeout=10,
+            # Detect connections silently dropped by NAT/firewalls while idle
+            keepalive_interval=SSH_KEEPALIVE_INTERVAL,
+            keepalive_count_max=SSH_KEEPALIVE_COUNT_MAX,
+            # Large enough for every SFTP request in flight to be answered
+            window=self.window,
+            **auth,
+        )
 
-    def connect(self) -> None:
-        """Establish SSH connection to Proxmox host"""
-        if self._client is not None:
-            return
+    async def open(self) -> None:
+        """Pre-fill the pool, opening all connections concurrently
+
+        Raises:
+            ConnectionError: If any connection cannot be established
+        """
+        results = await asyncio.gather(
+            *[self._make_conn() for _ in range(self.size)], return_exceptions=True
+        )
 
-        self._client = paramiko.SSHClient()
-        self._client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            # Don't leak the connections that did succeed
+            for r in results:
+                if not isinstance(r, BaseException):
+                    r.close()
+            raise ConnectionError(
+                f"Failed to connect to Proxmox host {self.config.host}: {str(errors[0])}"
+            )
+
+        for conn in results:
+            entry = PooledConnection(conn)
+            self._entries.append(entry)
+            self._idle.put_nowait(entry)
+
+        # Start SFTP sessions up front so the first file operation doesn't
+        # pay for it. Best effort - failures are retried lazily on first use
+        await asyncio.gather(
+            *[entry.get_sftp() for entry in self._entries], return_exceptions=True
+        )
+
+    async def close(self) -> None:
+        """Close every connection owned by the pool"""
+        entries, self._entries = self._entries, []
+        for entry in entries:
+            entry.close()
+        for entry in entries:
+            if entry.conn:
+                await entry.conn.wait_closed()
+                entry.conn = None
+
+    async def acquire(self) -> PooledConnection:
+        """Borrow a connection, waiting if all are in use
+
+        Connections already known to be closed (e.g. dropped by the server or
+        after failed keepalives) are replaced right away. Connections idle for
+        longer than POOL_VALIDATE_AFTER seconds are probed first and
+        transparently replaced if the probe fails.
+        """
+        entry = await self._idle.get()
 
         try:
-            if self.config.key_path:
-                # Connect using SSH key
-                self._client.connect(
-                    hostname=self.config.host,
-                    port=self.config.port,
-                    username=self.config.username,
-                    key_filename=self.config.key_path,
-                    timeout=10,
-                )
-            else:
-                # Connect using password
-                self._client.connect(
-                    hostname=self.config.host,
-                    port=self.config.port,
-                    username=self.config.username,
-                    password=self.config.password,
-                    timeout=10,
-                )
+            if entry.conn is not None and entry.conn.is_closed():
+                entry.close()
+                entry.conn = None
+            elif (
+                entry.conn is not None
+                and time.monotonic() - entry.last_used > POOL_VALIDATE_AFTER
+            ):
+                try:
+                    await entry.conn.run("true", check=True, timeout=2)
+                except Exception:
+                    entry.close()
+                    entry.conn = None
+
+            if entry.conn is None:
+                entry.conn = await self._make_conn()
         except Exception as e:
-            self._client = None
+            # Return the slot so a later request can retry the reconnect
+            self._idle.put_nowait(entry)
             raise ConnectionError(
                 f"Failed to connect to Proxmox host {self.config.host}: {str(e)}"
             )
+        except BaseException:
+            # Cancelled mid-probe or mid-reconnect - the slot must still go
+            # back, or the pool shrinks for good
+            self._idle.put_nowait(entry)
+            raise
+
+        return entry
+
+    def release(self, entry: PooledConnection) -> None:
+        """Return a borrowed connection to the pool"""
+        entry.last_used = time.monotonic()
+        self._idle.put_nowait(entry)
+
+    @asynccontextmanager
+    async def connection(self):
+        """Borrow a pooled connection for the duration of a ``async with`` block"""
+        entry = await self.acquire()
+        try:
+            yield entry
+        finally:
+            self.release(entry)
+
+
+class SSHConnectionManager:
+    """Manages SSH connections to Proxmox host"""
+
+    def __init__(self, config: ProxmoxConfig):
+        self.config = config
+        self._pool: Optional[SSHConnectionPool] = None
+        # Fire-and-forget cleanups, referenced so they aren't garbage collected
+        self._background_tasks: Set[asyncio.Task] = set()
+
+    @property
+    def is_connected(self) -> bool:
+        """Whether the connection pool has been opened"""
+        return self._pool is not None
+
+    async def connect(self) -> None:
+        """Establish SSH connections to Proxmox host"""
+        if self._pool is not None:
+            return
+
+        pool = SSHConnectionPool(self.config)
+        await pool.open()
+        self._pool = pool
+
+    async def disconnect(self) -> None:
+        """Close SSH connections, letting pending background cleanups finish"""
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
 
-    def disconnect(self) -> None:
-        """Close SSH connection"""
-        if self._sftp:
-            self._sftp.close()
-            self._sftp = None
-        if self._client:
-            self._client.close()
-            self._client = None
+        if self._pool:
+            await self._pool.close()
+            self._pool = None
 
-    def get_sftp_client(self) -> paramiko.SFTPClient:
-        """Get or create SFTP client
+        # Cached listings are keyed by manager - drop them so a closed manager
+        # isn't kept alive by the cache (HTTP mode opens one per session)
+        list_containers.invalidate()
+
+    def _get_pool(self) -> SSHConnectionPool:
+        """Get the active connection pool
 
         Returns:
-            SFTP client for file transfers
+            Opened SSH connection pool
         """
-        if not self._client:
+        if not self._pool:
             raise RuntimeError("SSH client not connected. Call connect() first.")
 
-        if not self._sftp:
-            self._sftp = self._client.open_sftp()
-
-        return self._sftp
+        return self._pool
 
-    async def download_file(self, remote_path: str, local_path: str) -> None:
+    async def download_file(self, remote_path: str, local_path: str) -> int:
         """Download a file from remote host to local machine
 
         Args:
             remote_path: Path on remote host
             local_path: Path on local machine
 
+        Returns:
+            int: Number of bytes written to local_path
+
         Raises:
             RuntimeError: If download fails
         """
+        copied = 0
+
+        def progress(_src: bytes, _dst: bytes, bytes_copied: int, _total: int) -> None:
+            nonlocal copied
+            copied = bytes_copied
+
         try:
-            sftp = self.get_sftp_client()
-            sftp.get(remote_path, local_path)
+            async with self._get_pool().connection() as entry:
+                sftp = await entry.get_sftp()
+                try:
+                    await sftp.get(
+                        remote_path,
+                        local_path,
+                        block_size=self.config.sftp_block_size,
+                        max_requests=self.config.sftp_max_requests,
+                        progress_handler=progress,
+                    )
+                except _SFTP_SESSION_ERRORS:
+                    entry.close_sftp()
+                    raise
         except Exception as e:
             raise RuntimeError(f"Failed to download file from {remote_path}: {str(e)}")
 
-    async def upload_file(self, local_path: str, remote_path: str) -> None:
+        return copied
+
+    @staticmethod
+    async def _create_exclusive(sftp: asyncssh.SFTPClient, remote_path: str) -> None:
+        """Create an empty remote file, failing if the path already exists
+
+        Raises:
+            FileExistsError: If remote_path exists
+            asyncssh.SFTPError: If the file can't be created for another reason
+        """
+        try:
+            f = await sftp.open(
+                remote_path, asyncssh.FXF_WRITE | asyncssh.FXF_CREAT | asyncssh.FXF_EXCL
+            )
+        except asyncssh.SFTPFileAlreadyExists:
+            raise FileExistsError(remote_path) from None
+        except asyncssh.SFTPFailure as e:
+            # SFTPv3 servers (OpenSSH) report EEXIST as a generic failure, just
+            # like EROFS, ENOSPC or ENOTDIR - only a path that is really there
+            # means "already exists", anything else keeps its own error
+            try:
+                await sftp.lstat(remote_path)
+            except asyncssh.SFTPError:
+                raise e from None
+            raise FileExistsError(remote_path) from None
+        await f.close()
+
+    async def upload_file(
+        self, local_path: str, remote_path: str, overwrite: bool = True
+    ) -> int:
         """Upload a file from local machine to remote host
 
         Args:
             local_path: Path on local machine
             remote_path: Path on remote host
+            overwrite: Replace remote_path if it exists. If False the file is
+                created with O_EXCL, which fails atomically if anything is
+                already at that path
+
+        Returns:
+            int: Number of bytes written to remote_path
 
         Raises:
+            FileExistsError: If overwrite is False and remote_path exists
             RuntimeError: If upload fails
         """
+        copied = 0
+
+        def progress(_src: bytes, _dst: bytes, bytes_copied: int, _total: int) -> None:
+            nonlocal copied
+            copied = bytes_copied
+
         try:
-            sftp = self.get_sftp_client()
-            sftp.put(local_path, remote_path)
+            async with self._get_pool().connection() as entry:
+                sftp = await entry.get_sftp()
+                try:
+                    if not overwrite:
+                        await self._create_exclusive(sftp, remote_path)
+                    try:
+                        await sftp.put(
+                            local_path,
+                            remote_path,
+                            block_size=min(
+                                self.config.sftp_block_size, SFTP_MAX_WRITE_SIZE
+                            ),
+                            max_requests=self.config.sftp_max_requests,
+                            progress_handler=progress,
+                        )
+                    except BaseException:
+                        if not overwrite:
+                            # Drop the placeholder we created, or a retry would
+                            # report the file as already existing
+                            with suppress(Exception):
+                                await sftp.remove(remote_path)
+                        raise
+                except _SFTP_SESSION_ERRORS:
+                    entry.close_sftp()
+                    raise
+        except FileExistsError:
+            raise
         except Exception as e:
             raise RuntimeError(f"Failed to upload file to {remote_path}: {str(e)}")
 
+        return copied
+
+    async def stat_remote(self, path: str) -> asyncssh.SFTPAttrs:
+        """Get the attributes of a file on the remote host over SFTP
+
+        Args:
+            path: Path on remote host
+
+        Returns:
+            SFTPAttrs: File attributes (size, permissions, type, ...)
+
+        Raises:
+            asyncssh.SFTPError: If the path cannot be stat'ed (e.g. missing)
+            RuntimeError: If the SFTP session is lost
+        """
+        async with self._get_pool().connection() as entry:
+            sftp = await entry.get_sftp()
+            try:
+                return await sftp.stat(path)
+            except _SFTP_SESSION_ERRORS as e:
+                entry.close_sftp()
+                raise RuntimeError(f"Failed to stat {path}: {str(e)}")
+
+    async def chmod_remote(self, path: str, mode: int) -> None:
+        """Change the permissions of a file on the remote host over SFTP
+
+        Args:
+            path: Path on remote host
+            mode: Permission bits (e.g. 0o644)
+
+        Raises:
+            asyncssh.SFTPError: If the permissions cannot be changed
+            RuntimeError: If the SFTP session is lost
+        """
+        async with self._get_pool().connection() as entry:
+            sftp = await entry.get_sftp()
+            try:
+                await sftp.chmod(path, mode)
+            except _SFTP_SESSION_ERRORS as e:
+                entry.close_sftp()
+                raise RuntimeError(f"Failed to chmod {path}: {str(e)}")
+
+    async def stream_file_to_command(
+        self, local_path: str, command: str, timeout: int = 300
+    ) -> Tuple[str, str, int]:
+        """Run a command on remote host with a local file streamed to its stdin
+
+        Args:
+            local_path: Path on local machine
+            command: Command reading the file content from stdin
+            timeout: Seconds to wait for the transfer and command to finish
+
+        Returns:
+            Tuple: (stdout, stderr, exit_code)
+
+        Raises:
+            RuntimeError: If the transfer fails or times out
+        """
+        try:
+            async with self._get_pool().connection() as entry:
+                # Binary mode - file content must reach stdin undecoded
+                process = await entry.conn.create_process(
+                    command, stdin=local_path, encoding=None
+                )
+                try:
+                    result = await asyncio.wait_for(process.wait(), timeout)
+                finally:
+                    # Stop streaming and free the channel on timeout/cancellation
+                    process.close()
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"File transfer timed out after {timeout} seconds")
+        except Exception as e:
+            raise RuntimeError(f"Failed to stream file {local_path}: {str(e)}")
+
+        exit_code = result.exit_status
+        return (
+            (result.stdout or b"").decode("utf-8", errors="replace"),
+            (result.stderr or b"").decode("utf-8", errors="replace"),
+            -1 if exit_code is None else exit_code,
+        )
+
     async def cleanup_remote_file(self, remote_path: str) -> None:
         """Remove a file from remote host
 
@@ -418,38 +990,69 @@ class SSHConnectionManager:
             remote_path: Path on remote host to remove
         """
         try:
-            sftp = self.get_sftp_client()
-            sftp.remove(remote_path)
+            async with self._get_pool().connection() as entry:
+                sftp = await entry.get_sftp()
+                await sftp.remove(remote_path)
         except Exception:
             # Ignore errors during cleanup
             pass
 
+    def schedule_cleanup(self, remote_path: str) -> None:
+        """Remove a file from remote host in the background
+
+        Callers don't wait for the removal round-trip; pending removals are
+        completed on disconnect.
+
+        Args:
+            remote_path: Path on remote host to remove
+        """
+        task = asyncio.create_task(self.cleanup_remote_file(remote_path))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
     async def execute_command(
-        self, command: str, timeout: int = 30
-    ) -> Tuple[str, str, int]:
+        self, command: str, timeout: int = 30, max_bytes: Optional[int] = None
+    ) -> Tuple[str, str, int, bool]:
         """
         Execute a command via SSH
 
+        Output beyond `max_bytes` per stream (default: MAX_OUTPUT_BYTES) is
+        discarded and the channel closed, so memory stays bounded no matter
+        how much the remote command prints.
+
         Returns:
-            Tuple: (stdout, stderr, exit_code)
+            Tuple: (stdout, stderr, exit_code, truncated)
         """
-        if not self._client:
-            raise RuntimeError("SSH client not connected. Call connect() first.")
+        pool = self._get_pool()
+        limit = self.config.max_output_bytes if max_bytes is None else max_bytes
 
         try:
-            stdin, stdout, stderr = self._client.exec_command(command, timeout=timeout)
-
-            # Wait for command to complete
-            exit_code = stdout.channel.recv_exit_status()
+            # Runs on the event loop - other tool calls keep progressing
+            async with pool.connection() as entry:
+                if _SHELL_SAFE_COMMAND_RE.fullmatch(command):
+                    return await entry.run_in_shell(command, timeout, limit)
 
-            stdout_data = stdout.read().decode("utf-8", errors="replace")
-            stderr_data = stderr.read().decode("utf-8", errors="replace")
-
-            return stdout_data, stderr_data, exit_code
+                return await entry.run_command(command, timeout, limit)
 
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"Command timed out after {timeout} seconds")
         except Exception as e:
             raise RuntimeError(f"Failed to execute command: {str(e)}")
 
+    async def exec_script(
+        self, script: str, args: List[str], timeout: int = 30
+    ) -> Tuple[str, str, int, bool]:
+        """Run a shell script on the remote host with positional arguments
+
+        The arguments reach the script as "$1", "$2", ... without being
+        parsed by the shell, so paths need no escaping inside the script.
+
+        Returns:
+            Tuple: (stdout, stderr, exit_code, truncated)
+        """
+        command = shlex.join(["sh", "-c", script, "sh", *args])
+        return await self.execute_command(command, timeout=timeout)
+
 
 # ============================================================================
 # Helper Functions
@@ -458,37 +1061,115 @@ class SSHConnectionManager:
 
 def parse_pct_list_output(output: str) -> List[Dict[str, Any]]:
     """Parse 'pct list' command output into structured data"""
-    lines = output.strip().split("\n")
-    if len(lines) < 2:
-        return []
-
     # First line is header
-    containers = []
-    for line in lines[1:]:
-        parts = line.split()
-        if len(parts) >= 3:
-            containers.append(
-                {
-                    "vmid": int(parts[0]),
-                    "status": parts[1],
-                    "name": parts[2] if len(parts) > 2 else "",
-                }
-            )
+    header_end = output.find("\n")
+    if header_end == -1:
+        return []
 
-    return containers
+    return [
+        {"vmid": int(m[1]), "status": m[2], "name": m[3]}
+        for m in _PCT_ROW_RE.finditer(output, header_end)
+    ]
 
 
 def parse_pct_status_output(output: str) -> Dict[str, str]:
-    """Parse 'pct status' command output"""
-    output = output.strip().lower()
-    if "running" in output:
-        status = "running"
-    elif "stopped" in output:
-        status = "stopped"
-    else:
-        status = "unknown"
+    """Parse 'pct status' command output
+
+    Returns one of the shared _STATUS_* dicts - callers must not mutate it.
+    """
+    # The status word is on the first line ("status: running"), so only the
+    # head of the output is inspected
+    head = output[:64].lower()
+    if "running" in head:
+        return _STATUS_RUNNING
+    if "stopped" in head:
+        return _STATUS_STOPPED
+    return _STATUS_UNKNOWN
+
+
+def dumps_json(obj: Any, pretty: bool = False) -> str:
+    """Serialize to JSON, using orjson when it is installed
+
+    Compact by default; `pretty` indents by two spaces, matching
+    json.dumps(indent=2). Tools return successful results compact (they are
+    read by the client) and pretty-print errors, which people read.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+# Static error responses, serialized once at import
+_ERR_NO_SSH = dumps_json({"error": "SSH connection not initialized", "success": False})
+_ERR_HOST_EXEC_DISABLED = dumps_json(
+    {
+        "error": "Host command execution is DISABLED for safety",
+        "success": False,
+        "message": "To enable this feature, set environment variable: ENABLE_HOST_EXEC=true",
+        "reason": "This feature can affect your entire Proxmox infrastructure and is disabled by default",
+        "documentation": "See README for security considerations and best practices",
+    },
+    pretty=True,
+)
+_ERR_HOST_FILES_DISABLED = dumps_json(
+    {
+        "error": "Host file operations are DISABLED for safety",
+        "success": False,
+        "message": "To enable this feature, set environment variable: ENABLE_HOST_EXEC=true",
+        "reason": "Host operations can affect your entire Proxmox infrastructure",
+        "documentation": "See README for security considerations and best practices",
+    },
+    pretty=True,
+)
+
+
+def _json_escape(value: str) -> str:
+    """Escape a string for splicing into a JSON string literal"""
+    return dumps_json(value)[1:-1]
+
+
+# Error templates shared by the file tools, filled in with `%` - integers
+# as-is, strings through _json_escape
+_ERR_FILE_TOO_LARGE = dumps_json(
+    {
+        "error": "File size (%d bytes) exceeds maximum allowed (%d bytes)",
+        "success": False,
+        "suggestion": "Increase MAX_FILE_SIZE environment variable or choose a smaller file",
+    },
+    pretty=True,
+)
+_ERR_LOCAL_FILE_EXISTS = dumps_json(
+    {
+        "error": "Local file already exists: %s",
+        "success": False,
+        "suggestion": "Set overwrite=true to replace existing file or choose a different path",
+    },
+    pretty=True,
+)
+_ERR_LOCAL_FILE_NOT_FOUND = dumps_json(
+    {
+        "error": "Local file not found: %s",
+        "success": False,
+        "suggestion": "Check the local file path is correct and file exists",
+    },
+    pretty=True,
+)
 
-    return {"status": status}
+# Compact success responses of the host file tools, in the same form as
+# dumps_json output. Paths go through _json_escape; permissions are
+# validated octal digits and bytes_transferred an int, so need no escaping
+_HOST_DOWNLOAD_OK = (
+    '{"success":true,"message":"File downloaded successfully from Proxmox host",'
+    '"host_path":"%s","local_path":"%s","bytes_transferred":%d}'
+)
+_HOST_UPLOAD_OK = (
+    '{"success":true,"message":"File uploaded successfully to Proxmox host",'
+    '"local_path":"%s","host_path":"%s","permissions":"%s","bytes_transferred":%d}'
+)
 
 
 def format_exec_output(
@@ -497,6 +1178,7 @@ def format_exec_output(
     exit_code: int,
     format_type: ResponseFormat,
     max_length: Optional[int] = None,
+    truncated: bool = False,
 ) -> str:
     """Format command execution output with proper truncation handling
 
@@ -509,6 +1191,8 @@ def format_exec_output(
         exit_code: Command exit code
         format_type: Output format (JSON or TEXT)
         max_length: Maximum output length (uses global character_limit if not specified)
+        truncated: Whether the remote output was already cut at MAX_OUTPUT_BYTES -
+            the command was stopped early, so exit_code is not reported
 
     Returns:
         Formatted output string (guaranteed valid JSON if format_type is JSON)
@@ -516,77 +1200,79 @@ def format_exec_output(
     if max_length is None:
         max_length = character_limit
 
-    if format_type == ResponseFormat.JSON:
+    if format_type is ResponseFormat.JSON:
         # For JSON: truncate data BEFORE creating JSON object to keep it valid
-        # Reserve space for JSON structure overhead (~500 chars for metadata)
-        json_overhead = 500
+        # Reserve space for JSON structure overhead - the compact structure
+        # including truncation metadata serializes to under 200 chars
+        json_overhead = 200
         available_space = max(
             max_length - json_overhead, 1000
         )  # Minimum 1000 chars for data
 
-        # Calculate original lengths
         stdout_original_len = len(stdout)
         stderr_original_len = len(stderr)
         total_len = stdout_original_len + stderr_original_len
 
-        # Track if truncation occurred
-        stdout_truncated = False
-        stderr_truncated = False
-
-        if total_len > available_space:
-            # Need to truncate - allocate space proportionally
-            if total_len > 0:
-                stdout_ratio = stdout_original_len / total_len
-                stderr_ratio = stderr_original_len / total_len
-
-                stdout_limit = int(available_space * stdout_ratio)
-                stderr_limit = int(available_space * stderr_ratio)
-            else:
-                stdout_limit = available_space // 2
-                stderr_limit = available_space // 2
-
-            if stdout_original_len > stdout_limit:
-                stdout = stdout[:stdout_limit]
-                stdout_truncated = True
-
-            if stderr_original_len > stderr_limit:
-                stderr = stderr[:stderr_limit]
-                stderr_truncated = True
-
-        # Build JSON object with truncation metadata
-        result = {
-            "exit_code": exit_code,
-            "stdout": stdout,
-            "stderr": stderr,
-            "success": exit_code == 0,
-        }
-
-        # Add truncation metadata if needed
-        if stdout_truncated:
+        if truncated:
+            # The channel was closed early - the exit status is unknown
+            result = {
+                "exit_code": None,
+                "stdout": stdout,
+                "stderr": stderr,
+                "output_truncated": True,
+            }
+        else:
+            result = {
+                "exit_code": exit_code,
+                "stdout": stdout,
+                "stderr": stderr,
+                "success": exit_code == 0,
+            }
+
+        # Fast path: typical command output fits without truncation
+        if total_len <= available_space:
+            return dumps_json(result)
+
+        # Need to truncate - allocate space proportionally
+        stdout_limit = int(available_space * stdout_original_len / total_len)
+        stderr_limit = int(available_space * stderr_original_len / total_len)
+
+        # Add truncation metadata where needed
+        if stdout_original_len > stdout_limit:
+            result["stdout"] = stdout[:stdout_limit]
             result["stdout_truncated"] = True
             result["stdout_original_length"] = stdout_original_len
 
-        if stderr_truncated:
+        if stderr_original_len > stderr_limit:
+            result["stderr"] = stderr[:stderr_limit]
             result["stderr_truncated"] = True
             result["stderr_original_length"] = stderr_original_len
 
-        return json.dumps(result, indent=2)
+        return dumps_json(result)
     else:
         # Text format: format then truncate
-        output_parts = []
-        if stdout:
-            output_parts.append(f"=== STDOUT ===\n{stdout}")
-        if stderr:
-            output_parts.append(f"=== STDERR ===\n{stderr}")
-        output_parts.append(f"=== EXIT CODE: {exit_code} ===")
-
-        output = "\n\n".join(output_parts)
-
+        output = (
+            (f"=== STDOUT ===\n{stdout}\n\n" if stdout else "")
+            + (f"=== STDERR ===\n{stderr}\n\n" if stderr else "")
+            + (
+                "=== EXIT CODE: unavailable (command stopped early) ==="
+                if truncated
+                else f"=== EXIT CODE: {exit_code} ==="
+            )
+        )
         # Truncate if needed
-        if len(output) > max_length:
-            truncated = output[:max_length]
-            truncation_msg = f"\n\n[OUTPUT TRUNCATED - showing first {max_length} of {len(output)} characters]"
-            return truncated + truncation_msg
+        output_len = len(output)
+        if output_len > max_length:
+            output = (
+                output[:max_length]
+                + f"\n\n[OUTPUT TRUNCATED - showing first {max_length} of {output_len} characters]"
+            )
+
+        if truncated:
+            output += (
+                "\n\n[OUTPUT TRUNCATED - command output exceeded MAX_OUTPUT_BYTES, "
+                "exit code unavailable]"
+            )
 
         return output
 
@@ -596,11 +1282,12 @@ def truncate_output(output: str, max_length: Optional[int] = None) -> str:
     if max_length is None:
         max_length = character_limit
 
-    if len(output) <= max_length:
+    output_len = len(output)
+    if output_len <= max_length:
         return output
 
     truncated = output[:max_length]
-    truncation_msg = f"\n\n[OUTPUT TRUNCATED - showing first {max_length} of {len(output)} characters]"
+    truncation_msg = f"\n\n[OUTPUT TRUNCATED - showing first {max_length} of {output_len} characters]"
     return truncated + truncation_msg
 
 
@@ -616,14 +1303,16 @@ def validate_path(path: str) -> Tuple[bool, Optional[str]]:
     if not path or not path.strip():
         return False, "Path cannot be empty"
 
-    # Check for path traversal attempts
-    if ".." in path:
-        return False, "Path cannot contain '..' (path traversal not allowed)"
-
-    # Path should not be too long
+    # Path should not be too long - checked first so huge inputs bail early
     if len(path) > 4096:
         return False, "Path exceeds maximum length of 4096 characters"
 
+    # Check for path traversal attempts - only whole '..' components count,
+    # so names like 'foo..bar' stay valid. Backslashes are treated as
+    # separators too, in case the local side is Windows
+    if ".." in PurePosixPath(path.replace("\\", "/")).parts:
+        return False, "Path cannot contain '..' (path traversal not allowed)"
+
     return True, None
 
 
@@ -631,9 +1320,9 @@ def get_temp_path() -> str:
     """Generate unique temporary file path on Proxmox host
 
     Returns:
-        Unique temporary path like /tmp/proxmox-mcp-{uuid}
+        Unique temporary path like /tmp/proxmox-mcp-{random hex}
     """
-    return f"/tmp/proxmox-mcp-{uuid.uuid4().hex}"
+    return f"/tmp/proxmox-mcp-{os.urandom(8).hex()}"
 
 
 def validate_permissions(perms: str) -> Tuple[bool, Optional[str]]:
@@ -649,7 +1338,7 @@ def validate_permissions(perms: str) -> Tuple[bool, Optional[str]]:
         return False, "Permissions cannot be empty"
 
     # Check if it's a valid octal string (3 or 4 digits, all 0-7)
-    if not re.match(r"^[0-7]{3,4}$", perms):
+    if not _PERMS_RE.fullmatch(perms):
         return (
             False,
             "Permissions must be a valid octal string (e.g., '644', '755', '0644')",
@@ -658,6 +1347,165 @@ def validate_permissions(perms: str) -> Tuple[bool, Optional[str]]:
     return True, None
 
 
+def async_ttl_cache(ttl: float):
+    """Cache a coroutine function's result per argument tuple for `ttl` seconds
+
+    Concurrent callers on a miss share a single refresh instead of all running
+    the function. Exceptions are not cached. The decorated function gains an
+    `invalidate()` method that drops every cached result.
+    """
+
+    def decorator(func):
+        cache: Dict[tuple, Tuple[float, Any]] = {}
+        lock = asyncio.Lock()
+
+        @functools.wraps(func)
+        async def wrapper(*args):
+            hit = cache.get(args)
+            if hit is not None and hit[0] > time.monotonic():
+                return hit[1]
+
+            async with lock:
+                # Another caller may have refreshed while we waited
+                hit = cache.get(args)
+                if hit is not None and hit[0] > time.monotonic():
+                    return hit[1]
+
+                value = await func(*args)
+                cache[args] = (time.monotonic() + ttl, value)
+                return value
+
+        wrapper.invalidate = cache.clear
+        return wrapper
+
+    return decorator
+
+
+class CommandFailedError(RuntimeError):
+    """A remote command exited with a non-zero status"""
+
+    def __init__(self, message: str, stderr: str):
+        super().__init__(message)
+        self.stderr = stderr
+
+
+class SSHNotInitializedError(RuntimeError):
+    """Raised when a tool runs before the SSH connection is set up"""
+
+
+@async_ttl_cache(ttl=CONTAINER_LIST_TTL)
+async def list_containers(manager: "SSHConnectionManager") -> List[Dict[str, Any]]:
+    """Run and parse `pct list`, reusing the result for CONTAINER_LIST_TTL seconds
+
+    Call `list_containers.invalidate()` after changing container state.
+
+    Raises:
+        CommandFailedError: If `pct list` fails
+    """
+    stdout, stderr, exit_code, _ = await manager.execute_command("pct list")
+    if exit_code != 0:
+        raise CommandFailedError("Failed to list containers", stderr)
+
+    return parse_pct_list_output(stdout)
+
+
+# ============================================================================
+# Status Batching
+# ============================================================================
+
+
+class StatusBatcher:
+    """Coalesce concurrent container status lookups into one `pct list`
+
+    Lookups arriving within STATUS_BATCH_WINDOW seconds of each other share a
+    single `pct list` call instead of running one `pct status` each.
+    """
+
+    def __init__(self, window: float = STATUS_BATCH_WINDOW):
+        self.window = window
+        self._pending: Dict[int, List[asyncio.Future]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def get(self, manager: "SSHConnectionManager", vmid: int) -> Optional[str]:
+        """Get a container's status as reported by `pct list`
+
+        Returns:
+            Status string (e.g. "running"), or None if the container isn't listed
+
+        Raises:
+            RuntimeError: If `pct list` fails
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(vmid, []).append(future)
+
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush(manager))
+
+        return await future
+
+    async def _flush(self, manager: "SSHConnectionManager") -> None:
+        """Wait for the batch window to close, then answer every pending lookup"""
+        try:
+            await asyncio.sleep(self.window)
+        finally:
+            # Lookups from here on start a new batch
+            pending, self._pending = self._pending, {}
+            self._flush_task = None
+
+        try:
+            stdout, stderr, exit_code, _ = await manager.execute_command("pct list")
+            if exit_code != 0:
+                raise RuntimeError(f"Failed to list containers: {stderr.strip()}")
+            statuses = {c["vmid"]: c["status"] for c in parse_pct_list_output(stdout)}
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for vmid, futures in pending.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(statuses.get(vmid))
+
+
+_status_batcher = StatusBatcher()
+
+
+async def get_container_status(
+    manager: "SSHConnectionManager",
+    vmid: int,
+    fallback_limit: Optional[asyncio.Semaphore] = None,
+) -> Tuple[Optional[Dict[str, str]], str]:
+    """Look up a container's status, batched with concurrent lookups
+
+    Falls back to `pct status` for containers missing from `pct list`, so
+    its error output can be reported.
+
+    Args:
+        manager: SSH connection manager
+        vmid: Container VM ID
+        fallback_limit: Optional semaphore bounding concurrent `pct status`
+            fallbacks; the batched lookup itself is never held back by it
+
+    Returns:
+        Tuple: (status dict or None if the lookup failed, stderr)
+    """
+    status = await _status_batcher.get(manager, vmid)
+    if status is not None:
+        return parse_pct_status_output(status), ""
+
+    async with fallback_limit or nullcontext():
+        stdout, stderr, exit_code, _ = await manager.execute_command(
+            f"pct status {vmid}"
+        )
+    if exit_code != 0:
+        return None, stderr
+
+    return parse_pct_status_output(stdout), ""
+
+
 # ============================================================================
 # Initialize FastMCP Server
 # ============================================================================
@@ -678,16 +1526,17 @@ async def lifespan(app):
     is_valid, error_msg = config.validate()
 
     if not is_valid:
-        print(f"Configuration error: {error_msg}")
-        print("\nRequired environment variables:")
-        print(
-            "  I_ACCEPT_RISKS - MUST be set to 'true' to acknowledge risks (REQUIRED)"
+        logger.error(
+            "Configuration error: %s\n\n"
+            "Required environment variables:\n"
+            "  I_ACCEPT_RISKS - MUST be set to 'true' to acknowledge risks (REQUIRED)\n"
+            "  HOST - Proxmox host IP or hostname\n"
+            "  SSH_USERNAME - SSH username (default: root)\n"
+            "  SSH_PORT - SSH port (default: 22)\n"
+            "  SSH_PASSWORD - SSH password (or use SSH_KEY)\n"
+            "  SSH_KEY - Path to SSH private key (or use SSH_PASSWORD)",
+            error_msg,
         )
-        print("  HOST - Proxmox host IP or hostname")
-        print("  SSH_USERNAME - SSH username (default: root)")
-        print("  SSH_PORT - SSH port (default: 22)")
-        print("  SSH_PASSWORD - SSH password (or use SSH_KEY)")
-        print("  SSH_KEY - Path to SSH private key (or use SSH_PASSWORD)")
         raise RuntimeError(error_msg)
 
     # Set global character limit from config
@@ -698,20 +1547,69 @@ async def lifespan(app):
 
     try:
         # Connect to Proxmox host
-        ssh_manager.connect()
-        print(f"Connected to Proxmox host: {config.host}")
+        await ssh_manager.connect()
+        logger.info("Connected to Proxmox host: %s", config.host)
 
         yield {"ssh_manager": ssh_manager}
 
     finally:
         # Cleanup
         if ssh_manager:
-            ssh_manager.disconnect()
-            print("Disconnected from Proxmox host")
+            await ssh_manager.disconnect()
+            logger.info("Disconnected from Proxmox host")
 
 
 mcp = FastMCP("proxmox_mcp", lifespan=lifespan)
 
+
+def _require_ssh() -> SSHConnectionManager:
+    """Return the SSH connection manager
+
+    Raises:
+        SSHNotInitializedError: If the server has not connected yet
+    """
+    mgr = ssh_manager
+    if mgr is None:
+        raise SSHNotInitializedError()
+    return mgr
+
+
+def tool_errors(func):
+    """Map the shared tool preconditions to their JSON error responses
+
+    Tools call _require_ssh() instead of checking the manager themselves.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        except SSHNotInitializedError:
+            return _ERR_NO_SSH
+
+    return wrapper
+
+
+def requires_host_exec(disabled_response: str):
+    """Guard a tool that acts on the Proxmox host itself
+
+    The wrapped tool only runs when ENABLE_HOST_EXEC is set; otherwise
+    `disabled_response` is returned without touching the host. Apply below
+    @tool_errors.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not _require_ssh().config.enable_host_exec:
+                return disabled_response
+            return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
 # ============================================================================
 # Tools
 # ============================================================================
@@ -727,6 +1625,7 @@ mcp = FastMCP("proxmox_mcp", lifespan=lifespan)
         "openWorldHint": True,
     },
 )
+@tool_errors
 async def proxmox_container_exec_command(
     vmid: int, command: str, timeout: int = 30, response_format: str = "text"
 ) -> str:
@@ -752,6 +1651,10 @@ async def proxmox_container_exec_command(
         str: Command output in the requested format:
             - JSON format: {"exit_code": int, "stdout": str, "stderr": str, "success": bool}
             - TEXT format: Raw stdout/stderr with exit code
+            If the output exceeds MAX_OUTPUT_BYTES the command is cut short and
+            its exit status is unknown: JSON has "output_truncated": true,
+            "exit_code": null and no "success"; TEXT says the exit code is
+            unavailable
 
     Example:
         {"vmid": 100, "command": "df -h", "response_format": "text"}
@@ -789,39 +1692,37 @@ async def proxmox_container_exec_command(
         - If timeout: Returns timeout error after specified seconds
         - If SSH connection fails: Returns connection error with troubleshooting steps
     """
-    global ssh_manager
+    mgr = _require_ssh()
 
-    if not ssh_manager:
-        return json.dumps({"error": "SSH connection not initialized", "success": False})
+    # Normalize once so the success and error paths agree on the format
+    fmt_str = response_format.lower()
 
     try:
         # Convert response_format string to ResponseFormat enum
-        fmt = ResponseFormat(response_format.lower())
+        fmt = ResponseFormat(fmt_str)
 
-        # Build pct exec command
-        # Escape single quotes in the command
-        escaped_command = command.replace("'", "'\\''")
-        pct_command = f"pct exec {vmid} -- bash -c '{escaped_command}'"
+        # Build pct exec command, passing the command as one shell-quoted word
+        pct_command = f"pct exec {vmid} -- bash -c {shlex.quote(command)}"
 
         # Execute command
-        stdout, stderr, exit_code = await ssh_manager.execute_command(
+        stdout, stderr, exit_code, truncated = await mgr.execute_command(
             pct_command, timeout=timeout
         )
 
         # Format output (truncation handled internally)
-        return format_exec_output(stdout, stderr, exit_code, fmt)
+        return format_exec_output(stdout, stderr, exit_code, fmt, truncated=truncated)
 
     except Exception as e:
         error_msg = str(e)
 
-        if response_format.lower() == "json":
-            return json.dumps(
+        if fmt_str == "json":
+            return dumps_json(
                 {
                     "error": error_msg,
                     "success": False,
                     "suggestion": "Check if container exists and is running using 'proxmox_list_containers' tool",
                 },
-                indent=2,
+                pretty=True,
             )
         else:
             return f"Error: {error_msg}\n\nSuggestion: Check if container exists and is running using 'proxmox_list_containers' tool"
@@ -837,6 +1738,7 @@ async def proxmox_container_exec_command(
         "openWorldHint": True,
     },
 )
+@tool_errors
 async def proxmox_list_containers(response_format: str = "json") -> str:
     """List all LXC containers on the Proxmox host.
 
@@ -855,43 +1757,67 @@ async def proxmox_list_containers(response_format: str = "json") -> str:
         {"response_format": "json"}
         {"response_format": "text"}
     """
-    global ssh_manager
-
-    if not ssh_manager:
-        return json.dumps({"error": "SSH connection not initialized", "success": False})
+    mgr = _require_ssh()
 
     try:
-        # Execute pct list
-        stdout, stderr, exit_code = await ssh_manager.execute_command("pct list")
-
-        if exit_code != 0:
-            return json.dumps(
-                {
-                    "error": "Failed to list containers",
-                    "stderr": stderr,
-                    "success": False,
-                },
-                indent=2,
-            )
-
-        # Parse output
-        containers = parse_pct_list_output(stdout)
+        # Inventory changes rarely - a recent `pct list` is reused
+        containers = await list_containers(mgr)
 
         if response_format.lower() == "json":
-            return json.dumps(containers, indent=2)
+            return dumps_json(containers)
         else:
             # Text format
             if not containers:
                 return "No containers found"
 
-            lines = ["VMID | Status | Name", "-" * 40]
-            for ct in containers:
-                lines.append(f"{ct['vmid']:4d} | {ct['status']:7s} | {ct['name']}")
-
-            return "\n".join(lines)
+            return _CONTAINER_TABLE_HEADER + "\n".join(
+                f"{ct['vmid']:4d} | {ct['status']:7s} | {ct['name']}"
+                for ct in containers
+            )
 
+    except CommandFailedError as e:
+        return dumps_json(
+            {"error": str(e), "stderr": e.stderr, "success": False}, pretty=True
+        )
     except Exception as e:
-        return json.dumps({"error": str(e), "success": False}, indent=2)
+        return dumps_json({"error": str(e), "success": False}, pretty=True)
+
+
+async def _container_status_many(vmids: List[int], response_format: str) -> str:
+    """Get the status of several containers, querying them concurrently
+
+    Lookups are batched into a shared `pct list`; the `pct status` fallback
+    for unlisted containers is capped at the SSH pool size so a long list
+    doesn't queue more work than there are connections to run it on.
+    """
+    mgr = _require_ssh()
+    semaphore = asyncio.Semaphore(mgr.config.ssh_pool_size)
+
+    async def get_one(vmid: int) -> Dict[str, Any]:
+        try:
+            status_data, stderr = await get_container_status(mgr, vmid, semaphore)
+        except Exception as e:
+            return {"vmid": vmid, "error": str(e)}
+
+        if status_data is None:
+            return {
+                "vmid": vmid,
+                "error": f"Container {vmid} not found or error occurred",
+                "stderr": stderr,
+            }
+
+        return {"vmid": vmid, **status_data}
+
+    # Skip duplicate VM IDs, keeping the requested order
+    results = await asyncio.gather(*[get_one(v) for v in dict.fromkeys(vmids)])
+
+    if response_format.lower() == "json":
+        return dumps_json({"containers": results})
+
+    return "\n".join(
+        f"Container {r['vmid']} is {r['status']}" if "status" in r else r["error"]
+        for r in results
+    )
 
 
 @mcp.tool(
@@ -904,56 +1830,58 @@ async def proxmox_list_containers(response_format: str = "json") -> str:
         "openWorldHint": True,
     },
 )
-async def proxmox_container_status(vmid: int, response_format: str = "json") -> str:
+@tool_errors
+async def proxmox_container_status(
+    vmid: Union[int, List[int]], response_format: str = "json"
+) -> str:
     """Get the current status of a specific Proxmox LXC container.
 
     This tool checks whether a container is running, stopped, or in another state.
+    Pass a list of VM IDs to check several containers at once - they are
+    queried concurrently.
 
     Args:
-        vmid (int): Container VM ID to check
+        vmid (int | list[int]): Container VM ID to check, or a list of VM IDs
         response_format (str): Output format - 'json' or 'text' (default: 'json')
 
     Returns:
         str: Container status in requested format:
-            - JSON format: {"status": "running"|"stopped"|"unknown"}
-            - TEXT format: Human-readable status message
+            - JSON format: {"status": "running"|"stopped"|"unknown"}, or for a
+              list {"containers": [{"vmid": 100, "status": "running"}, ...]}
+            - TEXT format: Human-readable status message (one line per container)
 
     Example:
         {"vmid": 100}
         {"vmid": 101, "response_format": "text"}
+        {"vmid": [100, 101, 102]}
     """
-    global ssh_manager
+    mgr = _require_ssh()
 
-    if not ssh_manager:
-        return json.dumps({"error": "SSH connection not initialized", "success": False})
+    if isinstance(vmid, list):
+        return await _container_status_many(vmid, response_format)
 
     try:
-        # Execute pct status
-        stdout, stderr, exit_code = await ssh_manager.execute_command(
-            f"pct status {vmid}"
-        )
+        # Concurrent status calls are coalesced into one `pct list`
+        status_data, stderr = await get_container_status(mgr, vmid)
 
-        if exit_code != 0:
-            return json.dumps(
+        if status_data is None:
+            return dumps_json(
                 {
                     "error": f"Container {vmid} not found or error occurred",
                     "stderr": stderr,
                     "success": False,
                     "suggestion": "Use 'proxmox_list_containers' to see available containers",
                 },
-                indent=2,
+                pretty=True,
             )
 
-        # Parse status
-        status_data = parse_pct_status_output(stdout)
-
         if response_format.lower() == "json":
-            return json.dumps(status_data, indent=2)
+            return dumps_json(status_data)
         else:
             return f"Container {vmid} is {status_data['status']}"
 
     except Exception as e:
-        return json.dumps({"error": str(e), "success": False}, indent=2)
+        return dumps_json({"error": str(e), "success": False}, pretty=True)
 
 
 @mcp.tool(
@@ -966,6 +1894,7 @@ async def proxmox_container_status(vmid: int, response_format: str = "json") ->
         "openWorldHint": True,
     },
 )
+@tool_errors
 async def proxmox_start_container(vmid: int) -> str:
     """Start a stopped Proxmox LXC container.
 
@@ -976,44 +1905,44 @@ async def proxmox_start_container(vmid: int) -> str:
         vmid (int): Container VM ID to start
 
     Returns:
-        str: JSON result with success status and message
+        str: JSON result with success status, message and the container's
+            resulting status
 
     Example:
         {"vmid": 100}
     """
-    global ssh_manager
-
-    if not ssh_manager:
-        return json.dumps({"error": "SSH connection not initialized", "success": False})
+    mgr = _require_ssh()
 
     try:
-        # Execute pct start
-        stdout, stderr, exit_code = await ssh_manager.execute_command(
-            f"pct start {vmid}"
+        # Execute pct start and read back the resulting state in the same exec
+        stdout, stderr, exit_code, _ = await mgr.execute_command(
+            f"pct start {vmid} && pct status {vmid}"
         )
+        # Container state may have changed - drop the cached `pct list`
+        list_containers.invalidate()
 
         if exit_code != 0:
-            return json.dumps(
+            return dumps_json(
                 {
                     "error": f"Failed to start container {vmid}",
                     "stderr": stderr,
                     "success": False,
                     "suggestion": "Check if container exists using 'proxmox_list_containers'",
                 },
-                indent=2,
+                pretty=True,
             )
 
-        return json.dumps(
+        return dumps_json(
             {
                 "success": True,
                 "message": f"Container {vmid} started successfully",
                 "vmid": vmid,
+                **parse_pct_status_output(stdout),
             },
-            indent=2,
         )
 
     except Exception as e:
-        return json.dumps({"error": str(e), "success": False}, indent=2)
+        return dumps_json({"error": str(e), "success": False}, pretty=True)
 
 
 @mcp.tool(
@@ -1026,6 +1955,7 @@ async def proxmox_start_container(vmid: int) -> str:
         "openWorldHint": True,
     },
 )
+@tool_errors
 async def proxmox_stop_container(vmid: int) -> str:
     """Stop a running Proxmox LXC container.
 
@@ -1036,44 +1966,44 @@ async def proxmox_stop_container(vmid: int) -> str:
         vmid (int): Container VM ID to stop
 
     Returns:
-        str: JSON result with success status and message
+        str: JSON result with success status, message and the container's
+            resulting status
 
     Example:
         {"vmid": 100}
     """
-    global ssh_manager
-
-    if not ssh_manager:
-        return json.dumps({"error": "SSH connection not initialized", "success": False})
+    mgr = _require_ssh()
 
     try:
-        # Execute pct stop
-        stdout, stderr, exit_code = await ssh_manager.execute_command(
-            f"pct stop {vmid}"
+        # Execute pct stop and read back the resulting state in the same exec
+        stdout, stderr, exit_code, _ = await mgr.execute_command(
+            f"pct stop {vmid} && pct status {vmid}"
         )
+        # Container state may have changed - drop the cached `pct list`
+        list_containers.invalidate()
 
         if exit_code != 0:
-            return json.dumps(
+            return dumps_json(
                 {
                     "error": f"Failed to stop container {vmid}",
                     "stderr": stderr,
                     "success": False,
                     "suggestion": "Check if container exists and is running using 'proxmox_container_status'",
                 },
-                indent=2,
+                pretty=True,
             )
 
-        return json.dumps(
+        return dumps_json(
             {
                 "success": True,
                 "message": f"Container {vmid} stopped successfully",
                 "vmid": vmid,
+                **parse_pct_status_output(stdout),
             },
-            indent=2,
         )
 
     except Exception as e:
-        return json.dumps({"error": str(e), "success": False}, indent=2)
+        return dumps_json({"error": str(e), "success": False}, pretty=True)
 
 
 @mcp.tool(
@@ -1086,6 +2016,8 @@ async def proxmox_stop_container(vmid: int) -> str:
         "openWorldHint": True,
     },
 )
+@tool_errors
+@requires_host_exec(_ERR_HOST_EXEC_DISABLED)
 async def proxmox_host_exec_command(
     command: str, timeout: int = 30, response_format: str = "text"
 ) -> str:
@@ -1143,6 +2075,10 @@ async def proxmox_host_exec_command(
         str: Command output in the requested format:
             - JSON format: {"exit_code": int, "stdout": str, "stderr": str, "success": bool}
             - TEXT format: Raw stdout/stderr with exit code
+            If the output exceeds MAX_OUTPUT_BYTES the command is cut short and
+            its exit status is unknown: JSON has "output_truncated": true,
+            "exit_code": null and no "success"; TEXT says the exit code is
+            unavailable
 
     Examples:
         {"command": "pct list", "response_format": "text"}
@@ -1189,47 +2125,34 @@ async def proxmox_host_exec_command(
         - No command filtering - relies on user responsibility
         - Use read-only commands when possible
     """
-    global ssh_manager
+    mgr = _require_ssh()
 
-    if not ssh_manager:
-        return json.dumps({"error": "SSH connection not initialized", "success": False})
-
-    # Safety check: Feature must be explicitly enabled
-    if not ssh_manager.config.enable_host_exec:
-        return json.dumps(
-            {
-                "error": "Host command execution is DISABLED for safety",
-                "success": False,
-                "message": "To enable this feature, set environment variable: ENABLE_HOST_EXEC=true",
-                "reason": "This feature can affect your entire Proxmox infrastructure and is disabled by default",
-                "documentation": "See README for security considerations and best practices",
-            },
-            indent=2,
-        )
+    # Normalize once so the success and error paths agree on the format
+    fmt_str = response_format.lower()
 
     try:
         # Convert response_format string to ResponseFormat enum
-        fmt = ResponseFormat(response_format.lower())
+        fmt = ResponseFormat(fmt_str)
 
         # Execute command directly on host (NO pct exec wrapper)
-        stdout, stderr, exit_code = await ssh_manager.execute_command(
+        stdout, stderr, exit_code, truncated = await mgr.execute_command(
             command, timeout=timeout
         )
 
         # Format output (truncation handled internally)
-        return format_exec_output(stdout, stderr, exit_code, fmt)
+        return format_exec_output(stdout, stderr, exit_code, fmt, truncated=truncated)
 
     except Exception as e:
         error_msg = str(e)
 
-        if response_format.lower() == "json":
-            return json.dumps(
+        if fmt_str == "json":
+            return dumps_json(
                 {
                     "error": error_msg,
                     "success": False,
                     "suggestion": "Check if the command is valid and you have necessary permissions",
                 },
-                indent=2,
+                pretty=True,
             )
         else:
             return f"Error: {error_msg}\n\nSuggestion: Check if the command is valid and you have necessary permissions"
@@ -1245,6 +2168,7 @@ async def proxmox_host_exec_command(
         "openWorldHint": True,
     },
 )
+@tool_errors
 async def proxmox_download_file_from_container(
     vmid: int, container_path: str, local_path: str, overwrite: bool = False
 ) -> str:
@@ -1282,103 +2206,83 @@ async def proxmox_download_file_from_container(
         - Local file exists and overwrite=false
         - Disk space issues
     """
-    global ssh_manager
-
-    if not ssh_manager:
-        return json.dumps({"error": "SSH connection not initialized", "success": False})
+    mgr = _require_ssh()
+    max_size = mgr.config.max_file_size
 
     try:
         # Validate paths
         is_valid, error_msg = validate_path(container_path)
         if not is_valid:
-            return json.dumps(
+            return dumps_json(
                 {"error": f"Invalid container path: {error_msg}", "success": False},
-                indent=2,
+                pretty=True,
             )
 
         is_valid, error_msg = validate_path(local_path)
         if not is_valid:
-            return json.dumps(
+            return dumps_json(
                 {"error": f"Invalid local path: {error_msg}", "success": False},
-                indent=2,
+                pretty=True,
             )
 
-        # Check if local file exists
-        if os.path.exists(local_path) and not overwrite:
-            return json.dumps(
-                {
-                    "error": f"Local file already exists: {local_path}",
-                    "success": False,
-                    "suggestion": "Set overwrite=true to replace existing file or choose a different path",
-                },
-                indent=2,
-            )
+        # Check if local file exists (off the event loop, as the path may be
+        # on a slow or network-mounted disk)
+        if not overwrite and await asyncio.to_thread(os.path.exists, local_path):
+            return _ERR_LOCAL_FILE_EXISTS % _json_escape(local_path)
 
         # Generate temp path on host
         temp_path = get_temp_path()
 
         try:
-            # Pull file from container to host temp location
-            pull_command = f"pct pull {vmid} {container_path} {temp_path}"
-            stdout, stderr, exit_code = await ssh_manager.execute_command(pull_command)
+            # Pull file from container to host temp location and report its
+            # size in the same round-trip
+            stdout, stderr, exit_code, _ = await mgr.exec_script(
+                'pct pull "$1" "$2" "$3" && stat -c%s -- "$3"',
+                [str(vmid), container_path, temp_path],
+            )
 
             if exit_code != 0:
-                return json.dumps(
+                # pct pull may have left a partial temp file behind
+                mgr.schedule_cleanup(temp_path)
+                return dumps_json(
                     {
                         "error": f"Failed to pull file from container {vmid}",
                         "stderr": stderr,
                         "success": False,
                         "suggestion": "Check if container exists, is running, and file path is correct",
                     },
-                    indent=2,
+                    pretty=True,
                 )
 
-            # Check file size on host
-            size_command = f"stat -c%s {temp_path}"
-            stdout, stderr, exit_code = await ssh_manager.execute_command(size_command)
-
-            if exit_code == 0:
-                file_size = int(stdout.strip())
-                if file_size > ssh_manager.config.max_file_size:
-                    # Cleanup temp file
-                    await ssh_manager.cleanup_remote_file(temp_path)
-                    return json.dumps(
-                        {
-                            "error": f"File size ({file_size} bytes) exceeds maximum allowed ({ssh_manager.config.max_file_size} bytes)",
-                            "success": False,
-                            "suggestion": "Increase MAX_FILE_SIZE environment variable or choose a smaller file",
-                        },
-                        indent=2,
-                    )
+            file_size = int(stdout.strip())
+            if file_size > max_size:
+                mgr.schedule_cleanup(temp_path)
+                return _ERR_FILE_TOO_LARGE % (file_size, max_size)
 
             # Download from host to local
-            await ssh_manager.download_file(temp_path, local_path)
+            bytes_transferred = await mgr.download_file(temp_path, local_path)
 
-            # Cleanup temp file
-            await ssh_manager.cleanup_remote_file(temp_path)
+            # Remove the temp file without holding up the response
+            mgr.schedule_cleanup(temp_path)
 
-            # Get final file size
-            local_file_size = os.path.getsize(local_path)
-
-            return json.dumps(
+            return dumps_json(
                 {
                     "success": True,
                     "message": f"File downloaded successfully from container {vmid}",
                     "vmid": vmid,
                     "container_path": container_path,
                     "local_path": local_path,
-                    "bytes_transferred": local_file_size,
+                    "bytes_transferred": bytes_transferred,
                 },
-                indent=2,
             )
 
         except Exception as e:
             # Cleanup temp file on error
-            await ssh_manager.cleanup_remote_file(temp_path)
+            mgr.schedule_cleanup(temp_path)
             raise e
 
     except Exception as e:
-        return json.dumps({"error": str(e), "success": False}, indent=2)
+        return dumps_json({"error": str(e), "success": False}, pretty=True)
 
 
 @mcp.tool(
@@ -1391,6 +2295,7 @@ async def proxmox_download_file_from_container(
         "openWorldHint": True,
     },
 )
+@tool_errors
 async def proxmox_upload_file_to_container(
     vmid: int,
     local_path: str,
@@ -1400,11 +2305,9 @@ async def proxmox_upload_file_to_container(
 ) -> str:
     """Upload a file from local machine to a Proxmox LXC container.
 
-    This tool uploads files from your local machine to inside containers using:
-    1. SFTP to upload from local to Proxmox host temp location
-    2. `pct push` to transfer file from host to inside container
-    3. Set file permissions inside container
-    4. Cleanup of temp files on host
+    This tool uploads files from your local machine to inside containers by
+    streaming the file over SSH into `pct exec`, which writes it to the
+    destination and sets its permissions - nothing is staged on the host.
 
     Use cases:
     - Deploy configuration files to containers
@@ -1436,127 +2339,100 @@ async def proxmox_upload_file_to_container(
         - Invalid permissions format
         - Disk space issues on host or container
     """
-    global ssh_manager
-
-    if not ssh_manager:
-        return json.dumps({"error": "SSH connection not initialized", "success": False})
+    mgr = _require_ssh()
+    max_size = mgr.config.max_file_size
 
     try:
         # Validate permissions
         is_valid, error_msg = validate_permissions(permissions)
         if not is_valid:
-            return json.dumps(
+            return dumps_json(
                 {"error": f"Invalid permissions: {error_msg}", "success": False},
-                indent=2,
+                pretty=True,
             )
 
         # Validate paths
         is_valid, error_msg = validate_path(container_path)
         if not is_valid:
-            return json.dumps(
+            return dumps_json(
                 {"error": f"Invalid container path: {error_msg}", "success": False},
-                indent=2,
+                pretty=True,
             )
 
         is_valid, error_msg = validate_path(local_path)
         if not is_valid:
-            return json.dumps(
+            return dumps_json(
                 {"error": f"Invalid local path: {error_msg}", "success": False},
-                indent=2,
+                pretty=True,
             )
 
-        # Check if local file exists
-        if not os.path.exists(local_path):
-            return json.dumps(
-                {
-                    "error": f"Local file not found: {local_path}",
-                    "success": False,
-                    "suggestion": "Check the local file path is correct and file exists",
-                },
-                indent=2,
-            )
+        # Check the local file exists and get its size with one stat call,
+        # run in a worker thread so slow disks don't stall the event loop
+        try:
+            local_stat = await asyncio.to_thread(os.stat, local_path)
+        except OSError:
+            return _ERR_LOCAL_FILE_NOT_FOUND % _json_escape(local_path)
 
         # Check file size
-        local_file_size = os.path.getsize(local_path)
-        if local_file_size > ssh_manager.config.max_file_size:
-            return json.dumps(
+        local_file_size = local_stat.st_size
+        if local_file_size > max_size:
+            return _ERR_FILE_TOO_LARGE % (local_file_size, max_size)
+
+        # Stream the file straight into the container over stdin - no
+        # staging copy on the host. The existence check runs in the same
+        # command, refusing with FILE_EXISTS_EXIT_CODE before anything is
+        # written. Content goes to a temp file next to the destination and is
+        # renamed into place only once all bytes arrived, so a failed or
+        # aborted transfer (closing the channel ends cat's stdin early) never
+        # replaces the destination
+        write_command = (
+            f"pct exec {vmid} -- sh -c "
+            f'\'[ "$3" = 1 ] || [ ! -f "$1" ] || exit {FILE_EXISTS_EXIT_CODE}; '
+            f't=$(mktemp "$1.XXXXXX") || exit 1; '
+            f'cat > "$t" && [ "$(wc -c < "$t")" -eq "$4" ] && '
+            f'chmod "$2" "$t" && mv -f "$t" "$1" || {{ rm -f "$t"; exit 1; }}\' '
+            f"sh {shlex.quote(container_path)} {permissions} {int(overwrite)} "
+            f"{local_file_size}"
+        )
+        stdout, stderr, exit_code = await mgr.stream_file_to_command(
+            local_path, write_command
+        )
+
+        if exit_code == FILE_EXISTS_EXIT_CODE and not overwrite:
+            return dumps_json(
                 {
-                    "error": f"File size ({local_file_size} bytes) exceeds maximum allowed ({ssh_manager.config.max_file_size} bytes)",
+                    "error": f"File already exists in container: {container_path}",
                     "success": False,
-                    "suggestion": "Increase MAX_FILE_SIZE environment variable or choose a smaller file",
+                    "suggestion": "Set overwrite=true to replace existing file or choose a different path",
                 },
-                indent=2,
+                pretty=True,
             )
 
-        # Check if container file exists (unless overwrite is true)
-        if not overwrite:
-            check_command = f"pct exec {vmid} -- test -f {container_path}"
-            stdout, stderr, exit_code = await ssh_manager.execute_command(check_command)
-            if exit_code == 0:
-                return json.dumps(
-                    {
-                        "error": f"File already exists in container: {container_path}",
-                        "success": False,
-                        "suggestion": "Set overwrite=true to replace existing file or choose a different path",
-                    },
-                    indent=2,
-                )
-
-        # Generate temp path on host
-        temp_path = get_temp_path()
-
-        try:
-            # Upload from local to host temp location
-            await ssh_manager.upload_file(local_path, temp_path)
-
-            # Push file from host to container
-            push_command = f"pct push {vmid} {temp_path} {container_path}"
-            stdout, stderr, exit_code = await ssh_manager.execute_command(push_command)
-
-            if exit_code != 0:
-                # Cleanup temp file
-                await ssh_manager.cleanup_remote_file(temp_path)
-                return json.dumps(
-                    {
-                        "error": f"Failed to push file to container {vmid}",
-                        "stderr": stderr,
-                        "success": False,
-                        "suggestion": "Check if container exists, is running, and destination path is valid",
-                    },
-                    indent=2,
-                )
-
-            # Set permissions on the file inside container
-            chmod_command = f"pct exec {vmid} -- chmod {permissions} {container_path}"
-            stdout, stderr, exit_code = await ssh_manager.execute_command(chmod_command)
-
-            if exit_code != 0:
-                # File was uploaded but permissions failed - not critical
-                pass
-
-            # Cleanup temp file
-            await ssh_manager.cleanup_remote_file(temp_path)
-
-            return json.dumps(
+        if exit_code != 0:
+            return dumps_json(
                 {
-                    "success": True,
-                    "message": f"File uploaded successfully to container {vmid}",
-                    "vmid": vmid,
-                    "local_path": local_path,
-                    "container_path": container_path,
-                    "permissions": permissions,
-                    "bytes_transferred": local_file_size,
+                    "error": f"Failed to push file to container {vmid}",
+                    "stderr": stderr,
+                    "success": False,
+                    "suggestion": "Check if container exists, is running, and destination path is valid",
                 },
-                indent=2,
+                pretty=True,
             )
 
-        except Exception as e:
-            # Cleanup temp file on error
-            await ssh_manager.cleanup_remote_file(temp_path)
-            raise e
+        return dumps_json(
+            {
+                "success": True,
+                "message": f"File uploaded successfully to container {vmid}",
+                "vmid": vmid,
+                "local_path": local_path,
+                "container_path": container_path,
+                "permissions": permissions,
+                "bytes_transferred": local_file_size,
+            },
+        )
 
     except Exception as e:
-        return json.dumps({"error": str(e), "success": False}, indent=2)
+        return dumps_json({"error": str(e), "success": False}, pretty=True)
 
 
 @mcp.tool(
@@ -1569,6 +2445,8 @@ async def proxmox_upload_file_to_container(
         "openWorldHint": True,
     },
 )
+@tool_errors
+@requires_host_exec(_ERR_HOST_FILES_DISABLED)
 async def proxmox_download_file_from_host(
     host_path: str, local_path: str, overwrite: bool = False
 ) -> str:
@@ -1605,95 +2483,59 @@ async def proxmox_download_file_from_host(
         - Permission denied
         - Local file exists and overwrite=false
     """
-    global ssh_manager
-
-    if not ssh_manager:
-        return json.dumps({"error": "SSH connection not initialized", "success": False})
-
-    # Check if host exec is enabled
-    if not ssh_manager.config.enable_host_exec:
-        return json.dumps(
-            {
-                "error": "Host file operations are DISABLED for safety",
-                "success": False,
-                "message": "To enable this feature, set environment variable: ENABLE_HOST_EXEC=true",
-                "reason": "Host operations can affect your entire Proxmox infrastructure",
-                "documentation": "See README for security considerations and best practices",
-            },
-            indent=2,
-        )
+    mgr = _require_ssh()
+    max_size = mgr.config.max_file_size
 
     try:
         # Validate paths
         is_valid, error_msg = validate_path(host_path)
         if not is_valid:
-            return json.dumps(
-                {"error": f"Invalid host path: {error_msg}", "success": False}, indent=2
+            return dumps_json(
+                {"error": f"Invalid host path: {error_msg}", "success": False},
+                pretty=True,
             )
 
         is_valid, error_msg = validate_path(local_path)
         if not is_valid:
-            return json.dumps(
+            return dumps_json(
                 {"error": f"Invalid local path: {error_msg}", "success": False},
-                indent=2,
+                pretty=True,
             )
 
-        # Check if local file exists
-        if os.path.exists(local_path) and not overwrite:
-            return json.dumps(
-                {
-                    "error": f"Local file already exists: {local_path}",
-                    "success": False,
-                    "suggestion": "Set overwrite=true to replace existing file or choose a different path",
-                },
-                indent=2,
-            )
+        # Check if local file exists (off the event loop, as the path may be
+        # on a slow or network-mounted disk)
+        if not overwrite and await asyncio.to_thread(os.path.exists, local_path):
+            return _ERR_LOCAL_FILE_EXISTS % _json_escape(local_path)
 
-        # Check file size on host
-        size_command = f"stat -c%s {host_path}"
-        stdout, stderr, exit_code = await ssh_manager.execute_command(size_command)
-
-        if exit_code != 0:
-            return json.dumps(
+        # Check file size on host over the already-open SFTP session
+        try:
+            attrs = await mgr.stat_remote(host_path)
+        except asyncssh.SFTPError as e:
+            return dumps_json(
                 {
                     "error": f"File not found on host: {host_path}",
-                    "stderr": stderr,
+                    "stderr": e.reason,
                     "success": False,
                     "suggestion": "Check if the host path is correct and file exists",
                 },
-                indent=2,
+                pretty=True,
             )
 
-        file_size = int(stdout.strip())
-        if file_size > ssh_manager.config.max_file_size:
-            return json.dumps(
-                {
-                    "error": f"File size ({file_size} bytes) exceeds maximum allowed ({ssh_manager.config.max_file_size} bytes)",
-                    "success": False,
-                    "suggestion": "Increase MAX_FILE_SIZE environment variable or choose a smaller file",
-                },
-                indent=2,
-            )
+        file_size = attrs.size or 0
+        if file_size > max_size:
+            return _ERR_FILE_TOO_LARGE % (file_size, max_size)
 
         # Download directly from host
-        await ssh_manager.download_file(host_path, local_path)
+        bytes_transferred = await mgr.download_file(host_path, local_path)
 
-        # Get final file size
-        local_file_size = os.path.getsize(local_path)
-
-        return json.dumps(
-            {
-                "success": True,
-                "message": f"File downloaded successfully from Proxmox host",
-                "host_path": host_path,
-                "local_path": local_path,
-                "bytes_transferred": local_file_size,
-            },
-            indent=2,
+        return _HOST_DOWNLOAD_OK % (
+            _json_escape(host_path),
+            _json_escape(local_path),
+            bytes_transferred,
         )
 
     except Exception as e:
-        return json.dumps({"error": str(e), "success": False}, indent=2)
+        return dumps_json({"error": str(e), "success": False}, pretty=True)
 
 
 @mcp.tool(
@@ -1706,6 +2548,8 @@ async def proxmox_download_file_from_host(
         "openWorldHint": True,
     },
 )
+@tool_errors
+@requires_host_exec(_ERR_HOST_FILES_DISABLED)
 async def proxmox_upload_file_to_host(
     local_path: str, host_path: str, permissions: str = "644", overwrite: bool = False
 ) -> str:
@@ -1748,109 +2592,77 @@ async def proxmox_upload_file_to_host(
         - Invalid permissions format
         - Disk space issues on host
     """
-    global ssh_manager
-
-    if not ssh_manager:
-        return json.dumps({"error": "SSH connection not initialized", "success": False})
-
-    # Check if host exec is enabled
-    if not ssh_manager.config.enable_host_exec:
-        return json.dumps(
-            {
-                "error": "Host file operations are DISABLED for safety",
-                "success": False,
-                "message": "To enable this feature, set environment variable: ENABLE_HOST_EXEC=true",
-                "reason": "Host operations can affect your entire Proxmox infrastructure",
-                "documentation": "See README for security considerations and best practices",
-            },
-            indent=2,
-        )
+    mgr = _require_ssh()
+    max_size = mgr.config.max_file_size
 
     try:
         # Validate permissions
         is_valid, error_msg = validate_permissions(permissions)
         if not is_valid:
-            return json.dumps(
+            return dumps_json(
                 {"error": f"Invalid permissions: {error_msg}", "success": False},
-                indent=2,
+                pretty=True,
             )
 
         # Validate paths
         is_valid, error_msg = validate_path(host_path)
         if not is_valid:
-            return json.dumps(
-                {"error": f"Invalid host path: {error_msg}", "success": False}, indent=2
+            return dumps_json(
+                {"error": f"Invalid host path: {error_msg}", "success": False},
+                pretty=True,
             )
 
         is_valid, error_msg = validate_path(local_path)
         if not is_valid:
-            return json.dumps(
+            return dumps_json(
                 {"error": f"Invalid local path: {error_msg}", "success": False},
-                indent=2,
+                pretty=True,
             )
 
-        # Check if local file exists
-        if not os.path.exists(local_path):
-            return json.dumps(
-                {
-                    "error": f"Local file not found: {local_path}",
-                    "success": False,
-                    "suggestion": "Check the local file path is correct and file exists",
-                },
-                indent=2,
-            )
+        # Check the local file exists and get its size with one stat call,
+        # run in a worker thread so slow disks don't stall the event loop
+        try:
+            local_stat = await asyncio.to_thread(os.stat, local_path)
+        except OSError:
+            return _ERR_LOCAL_FILE_NOT_FOUND % _json_escape(local_path)
 
         # Check file size
-        local_file_size = os.path.getsize(local_path)
-        if local_file_size > ssh_manager.config.max_file_size:
-            return json.dumps(
+        local_file_size = local_stat.st_size
+        if local_file_size > max_size:
+            return _ERR_FILE_TOO_LARGE % (local_file_size, max_size)
+
+        # Upload directly to host; without overwrite the remote file is
+        # created exclusively, so an existing file is never replaced
+        try:
+            bytes_transferred = await mgr.upload_file(
+                local_path, host_path, overwrite=overwrite
+            )
+        except FileExistsError:
+            return dumps_json(
                 {
-                    "error": f"File size ({local_file_size} bytes) exceeds maximum allowed ({ssh_manager.config.max_file_size} bytes)",
+                    "error": f"File already exists on host: {host_path}",
                     "success": False,
-                    "suggestion": "Increase MAX_FILE_SIZE environment variable or choose a smaller file",
+                    "suggestion": "Set overwrite=true to replace existing file or choose a different path",
                 },
-                indent=2,
+                pretty=True,
             )
 
-        # Check if host file exists (unless overwrite is true)
-        if not overwrite:
-            check_command = f"test -f {host_path}"
-            stdout, stderr, exit_code = await ssh_manager.execute_command(check_command)
-            if exit_code == 0:
-                return json.dumps(
-                    {
-                        "error": f"File already exists on host: {host_path}",
-                        "success": False,
-                        "suggestion": "Set overwrite=true to replace existing file or choose a different path",
-                    },
-                    indent=2,
-                )
-
-        # Upload directly to host
-        await ssh_manager.upload_file(local_path, host_path)
-
-        # Set permissions on the file
-        chmod_command = f"chmod {permissions} {host_path}"
-        stdout, stderr, exit_code = await ssh_manager.execute_command(chmod_command)
-
-        if exit_code != 0:
+        # Set permissions on the file over the same SFTP session
+        try:
+            await mgr.chmod_remote(host_path, int(permissions, 8))
+        except asyncssh.SFTPError:
             # File was uploaded but permissions failed - not critical
             pass
 
-        return json.dumps(
-            {
-                "success": True,
-                "message": f"File uploaded successfully to Proxmox host",
-                "local_path": local_path,
-                "host_path": host_path,
-                "permissions": permissions,
-                "bytes_transferred": local_file_size,
-            },
-            indent=2,
+        return _HOST_UPLOAD_OK % (
+            _json_escape(local_path),
+            _json_escape(host_path),
+            permissions,
+            bytes_transferred,
         )
 
     except Exception as e:
-        return json.dumps({"error": str(e), "success": False}, indent=2)
+        return dumps_json({"error": str(e), "success": False}, pretty=True)
 
 
 # ============================================================================
@@ -1858,34 +2670,58 @@ async def proxmox_upload_file_to_host(
 # ============================================================================
 
 
+def _health_response(ssh_connected: bool) -> Tuple[dict, dict]:
+    """Build the ASGI start and body messages for a /health response"""
+    response_body = json.dumps(
+        {
+            "status": "healthy",
+            "service": "proxmox-mcp-server",
+            "ssh_connected": ssh_connected,
+        }
+    ).encode("utf-8")
+
+    start = {
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+            [b"content-type", b"application/json"],
+            [b"content-length", str(len(response_body)).encode()],
+        ],
+    }
+    return start, {"type": "http.response.body", "body": response_body}
+
+
+# Only ssh_connected varies, so both possible responses are built once
+_HEALTH_CONNECTED = _health_response(True)
+_HEALTH_DISCONNECTED = _health_response(False)
+
+
+async def _handle_health(send) -> None:
+    """Send the /health response for the current SSH connection state"""
+    mgr = ssh_manager
+    start, body = (
+        _HEALTH_CONNECTED
+        if mgr is not None and mgr.is_connected
+        else _HEALTH_DISCONNECTED
+    )
+    await send(start)
+    await send(body)
+
+
+# Paths answered by the middleware itself - everything else goes to the MCP app
+_ROUTES = {"/health": _handle_health}
+
+
 async def health_check_middleware(scope, receive, send):
     """ASGI middleware that adds /health endpoint for HTTP mode
 
     This middleware intercepts requests to /health and returns a simple
     health check response. All other requests are passed to the MCP app.
     """
-    if scope["type"] == "http" and scope["path"] == "/health":
-        # Return health check response
-        health_response = {
-            "status": "healthy",
-            "service": "proxmox-mcp-server",
-            "ssh_connected": ssh_manager is not None and ssh_manager._client is not None,
-        }
-
-        response_body = json.dumps(health_response).encode("utf-8")
-
-        await send({
-            "type": "http.response.start",
-            "status": 200,
-            "headers": [
-                [b"content-type", b"application/json"],
-                [b"content-length", str(len(response_body)).encode()],
-            ],
-        })
-        await send({
-            "type": "http.response.body",
-            "body": response_body,
-        })
+    # Lifespan scopes carry no path, hence .get()
+    handler = _ROUTES.get(scope.get("path"))
+    if handler is not None and scope["type"] == "http":
+        await handler(send)
     else:
         # Pass through to MCP app
         await mcp_app(scope, receive, send)
@@ -1896,22 +2732,32 @@ async def health_check_middleware(scope, receive, send):
 # ============================================================================
 
 if __name__ == "__main__":
+    import argparse
     import sys
 
+    # Diagnostics go to stderr - stdout carries the protocol in stdio mode
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    # AsyncSSH logs every channel open at INFO - too chatty for a server
+    logging.getLogger("asyncssh").setLevel(logging.WARNING)
+
     # Load configuration early to access SERVER_PORT
     config = ProxmoxConfig()
 
+    parser = argparse.ArgumentParser(description="Proxmox MCP Server")
+    parser.add_argument("--http", action="store_true", help="Serve over HTTP instead of stdio")
+    parser.add_argument("--sse", action="store_true", help="Alias for --http")
+    parser.add_argument("--port", type=int, default=config.server_port, help="HTTP port (default: SERVER_PORT)")
+    # Listen on all interfaces for Docker
+    parser.add_argument("--host", default="0.0.0.0", help="HTTP bind address (default: 0.0.0.0)")
+    # Unknown arguments are ignored, as they were before
+    args, _ = parser.parse_known_args()
+
     # Check for HTTP/SSE mode flag (HTTP is recommended in FastMCP 2.x)
-    if "--http" in sys.argv or "--sse" in sys.argv:
-        # Extract port from command line or use default from config
-        port = config.server_port
-        host = "0.0.0.0"  # Listen on all interfaces for Docker
-
-        for i, arg in enumerate(sys.argv):
-            if arg == "--port" and i + 1 < len(sys.argv):
-                port = int(sys.argv[i + 1])
-            elif arg == "--host" and i + 1 < len(sys.argv):
-                host = sys.argv[i + 1]
+    if args.http or args.sse:
+        port = args.port
+        host = args.host
 
         # Use uvicorn to run HTTP transport with custom host/port
         # This is the recommended approach for FastMCP 2.x web deployment